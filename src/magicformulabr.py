@@ -7,20 +7,31 @@ Dados baixados do site http://fundamentus.com.br
 """
 
 import argparse
+import functools
 import logging
 
-import pandas as pd
-
-import requests
+# numpy, pandas and requests are imported inside the functions that use them,
+# so "-h" and argument errors do not pay for their import time
 
 URL = "http://fundamentus.com.br/resultado.php"
 
-MAGIC_METHOD_FIELD = {
-    "1": {"earnings yield": "P/L", "return on capital": "ROE"},
-    "2": {"earnings yield": "EV/EBIT", "return on capital": "ROIC"},
-    "3": {"earnings yield": "EV/EBITDA", "return on capital": "ROIC"},
+log = logging.getLogger(__name__)
+
+HEADERS = {
+    "User-agent": "Mozilla/5.0 (X11; Linux x86_64; rv:85.0)"
+    "Gecko/20100101 Firefox/85.0",
+    "Accept": "*/*",
+    "Accept-Encoding": "br, gzip, deflate",
 }
 
+# (earnings yield, return on capital) indexed by magic method number
+MAGIC_METHOD_FIELD = (
+    None,
+    ("P/L", "ROE"),
+    ("EV/EBIT", "ROIC"),
+    ("EV/EBITDA", "ROIC"),
+)
+
 
 ##############################################################################
 # Parse da linha de comando
@@ -116,32 +127,109 @@ def setup_logging(logfile=None, *, filemode="a", date_format=None, log_level="DE
     return logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def get_session():
+    """Return requests session shared by the module, with pooling and retries."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=2,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def rank_min(values, ascending=True):
+    """
+    Rank values as int32, ties receive the minimum rank.
+
+    Same result as pandas rank(method="min") for an array without NaN.
+
+    Parameters:
+        values   (ndarray): Values to rank
+        ascending   (bool): Rank in ascending or descending order
+    """
+    import numpy as np
+
+    order = np.argsort(values, kind="mergesort")
+    if not ascending:
+        # ties stay adjacent, so the reversed permutation ranks descending
+        order = order[::-1]
+    sorted_values = values[order]
+    # True where a run of equal values starts in the sorted array
+    run_start = np.empty(len(values), dtype=bool)
+    run_start[:1] = True
+    np.not_equal(sorted_values[1:], sorted_values[:-1], out=run_start[1:])
+    first_pos = np.flatnonzero(run_start)[np.cumsum(run_start) - 1]
+    ranks = np.empty(len(values), dtype=np.int32)
+    ranks[order] = first_pos + 1
+    return ranks
+
+
+def rank_order(rank, top=None):
+    """
+    Return the positions that sort rank in ascending order, ties keep their order.
+
+    Parameters:
+        rank (ndarray): Integer valued ranks
+        top      (int): Only return the positions of the top best ranked rows
+    """
+    import numpy as np
+
+    size = len(rank)
+    # partitioning only pays off when top is a small part of the rows
+    if top is not None and 0 < top < size // 4:
+        # unique keys make the partition pick the same rows as a stable sort
+        keys = rank.astype(np.int64) * size + np.arange(size)
+        top_pos = np.argpartition(keys, top - 1)[:top]
+        return top_pos[np.argsort(keys[top_pos])]
+    order = np.argsort(rank, kind="mergesort")
+    return order[:top] if top is not None and top > 0 else order
+
+
 class MagicFormula:
     """Magic Formula class."""
 
     def __init__(self, magic_method):
         """Initialize MagicFormula class."""
         self.pd_df = None
-        self.earnings_yield = MAGIC_METHOD_FIELD[magic_method]["earnings yield"]
-        self.ret_on_capital = MAGIC_METHOD_FIELD[magic_method]["return on capital"]
+        self.session = get_session()
+        magic_method = int(magic_method)
+        if not 0 < magic_method < len(MAGIC_METHOD_FIELD):
+            raise ValueError("Invalid magic_method")
+        self.earnings_yield, self.ret_on_capital = MAGIC_METHOD_FIELD[magic_method]
 
     def get_data(self):
         """Download data from fundamentus e create DataFrame."""
-        headers = {
-            "User-agent": "Mozilla/5.0 (X11; Linux x86_64; rv:85.0)"
-            "Gecko/20100101 Firefox/85.0",
-            "Accept": "*/*",
-            "Accept-Encoding": "gzip, deflate",
-        }
-        response = requests.get(URL, headers=headers)
-        self.pd_df = pd.read_html(
-            response.text,
-            thousands=".",
-            decimal=",",
-            index_col="Papel",
-            encoding="utf-8",
-            converters={self.ret_on_capital: self.pct_to_float},
-        )[0]
+        import lxml.html
+        import pandas as pd
+
+        # parse the body while it is downloaded, without building response.text
+        with self.session.get(URL, stream=True, timeout=60) as response:
+            response.raw.decode_content = True
+            parser = lxml.html.HTMLParser(encoding=response.encoding)
+            tree = lxml.html.parse(response.raw, parser=parser)
+        table = tree.getroot().get_element_by_id("resultado")
+        headers = [th.text_content().strip() for th in table.xpath(".//thead//th")]
+        rows = [
+            [td.text_content().strip() for td in tr.xpath("./td")]
+            for tr in table.xpath(".//tbody/tr")
+        ]
+        self.pd_df = pd.DataFrame(rows, columns=headers).set_index("Papel")
+        # percent columns are kept as text, except the return on capital
+        num_cols = [
+            col
+            for col in self.pd_df.columns
+            if col == self.ret_on_capital or not self.pd_df[col].str.endswith("%").any()
+        ]
+        self.pd_df[num_cols] = self.pd_df[num_cols].apply(self.pct_column_to_float)
 
     def filter_data(self):
         """
@@ -149,30 +237,27 @@ class MagicFormula:
 
         Remove rows with negative earnings yield, return on capital and Liq.2meses
         """
-        self.remove_rows(self.earnings_yield, 0)
-        self.remove_rows(self.ret_on_capital, 0)
-        self.remove_rows("Liq.2meses", 0)
-
-    def remove_rows(self, col_name, min_value):
-        """
-        Remove rows based on criteria.
-
-        Parameters:
-            col_name  (str): Column name
-            min_value (int): Minimum value
-        """
-        log.debug("Removing companies with %s less than %s", col_name, min_value)
-        tickers = self.pd_df.loc[self.pd_df[col_name] <= min_value].index
-        log.debug(self.pd_df.loc[tickers])
-        self.pd_df.drop(tickers, inplace=True)
+        log.debug(
+            "Removing companies with %s, %s or Liq.2meses less than 0",
+            self.earnings_yield,
+            self.ret_on_capital,
+        )
+        expr = " and ".join(
+            f"`{col}` > 0"
+            for col in (self.earnings_yield, self.ret_on_capital, "Liq.2meses")
+        )
+        # eval uses numexpr when it is installed, plain python otherwise
+        mask = self.pd_df.eval(expr)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Dropping:\n%s", self.pd_df.loc[~mask])
+        self.pd_df.drop(self.pd_df.index[~mask], inplace=True)
 
     def drop_unneeded_columns(self, level):
         """Remove columns."""
-        df_columns = self.pd_df.columns.tolist()
         if level == 0:
-            keep_cols = [self.earnings_yield, self.ret_on_capital]
+            keep_cols = {self.earnings_yield, self.ret_on_capital}
         elif level == 1:
-            keep_cols = [
+            keep_cols = {
                 "Cotação",
                 "Div.Yield",
                 "ROIC",
@@ -182,36 +267,58 @@ class MagicFormula:
                 "EV/EBITDA",
                 self.earnings_yield,
                 self.ret_on_capital,
-            ]
+            }
         else:
             return
 
-        remove_cols = [x for x in df_columns if x not in keep_cols]
-        self.pd_df.drop(remove_cols, axis="columns", inplace=True)
+        # keep the original column order, each column selected only once
+        self.pd_df = self.pd_df.loc[
+            :, [col for col in self.pd_df.columns if col in keep_cols]
+        ]
 
-    def calc_rank(self):
-        """Create magic formula rank."""
-        self.pd_df["Rank_earnings_yield"] = self.pd_df[self.earnings_yield].rank(
-            ascending=True, method="min"
-        )
-        self.pd_df["Rank_return_on_capital"] = self.pd_df[self.ret_on_capital].rank(
-            ascending=False, method="min"
-        )
-        self.pd_df["Rank_Final"] = (
-            self.pd_df["Rank_earnings_yield"] + self.pd_df["Rank_return_on_capital"]
+    def calc_rank(self, detail=True, top=None):
+        """
+        Create magic formula rank.
+
+        Parameters:
+            detail (bool): Keep the rank of each field besides Rank_Final
+            top     (int): Only keep the top best ranked companies
+        """
+        rank_earnings_yield = rank_min(self.pd_df[self.earnings_yield].to_numpy())
+        rank_ret_on_capital = rank_min(
+            self.pd_df[self.ret_on_capital].to_numpy(), ascending=False
         )
-        self.pd_df.sort_values(by="Rank_Final", ascending=True, inplace=True)
+        rank_final = rank_earnings_yield + rank_ret_on_capital
+        if detail:
+            self.pd_df = self.pd_df.assign(
+                Rank_earnings_yield=rank_earnings_yield,
+                Rank_return_on_capital=rank_ret_on_capital,
+                Rank_Final=rank_final,
+            )
+        else:
+            self.pd_df = self.pd_df.assign(Rank_Final=rank_final)
+        self.pd_df = self.pd_df.iloc[rank_order(rank_final, top)]
 
     def show_rank(self, top):
         """Show magic formula rank."""
-        self.pd_df.reset_index(inplace=True)
-        self.pd_df.index = self.pd_df.index + 1
-        print(self.pd_df.head(top).to_string())
+        rank = self.pd_df.head(top).reset_index()
+        rank.index = rank.index + 1
+        print(rank.to_string())
 
     @staticmethod
-    def pct_to_float(number):
-        """Convert string to float, remove % char and set decimal point to '.'."""
-        return float(number.strip("%").replace(".", "").replace(",", "."))
+    def pct_column_to_float(column):
+        """Convert strings to float, remove % char and set decimal point to '.'."""
+        from pandas import to_numeric
+        from pandas.api.types import is_numeric_dtype
+
+        if is_numeric_dtype(column):
+            return column
+        return to_numeric(
+            column.str.strip("%")
+            .str.replace(".", "", regex=False)
+            .str.replace(",", ".", regex=False),
+            errors="coerce",
+        )
 
 
 ##############################################################################
@@ -219,19 +326,18 @@ class MagicFormula:
 ##############################################################################
 def main():
     """Command line execution."""
-    global log
-
     # Parser the command line
     args = parse_parameters()
     # Configura log --debug
-    log = setup_logging() if args.debug else logging
+    if args.debug:
+        setup_logging()
     log.debug("CMD line args: %s", vars(args))
 
-    magicformula = MagicFormula(str(args.method))
+    magicformula = MagicFormula(args.method)
     magicformula.get_data()
     magicformula.filter_data()
     magicformula.drop_unneeded_columns(level=args.verbose)
-    magicformula.calc_rank()
+    magicformula.calc_rank(detail=args.verbose > 0, top=args.top)
     magicformula.show_rank(args.top)
 
 
@@ -17,12 +17,39 @@ def pd_df():
 def test_calc_rank_metod_2(pd_df):
     expected_result = """\
        EV/EBIT  ROIC  Rank_earnings_yield  Rank_return_on_capital  Rank_Final
-DDDD4      2.0    90                  2.0                     1.0         3.0
-AAAA3      0.2    10                  1.0                     4.0         5.0
-BBBB3      8.0    60                  4.0                     2.0         6.0
-CCCC3      4.0    40                  3.0                     3.0         6.0"""
+DDDD4      2.0    90                    2                       1           3
+AAAA3      0.2    10                    1                       4           5
+BBBB3      8.0    60                    4                       2           6
+CCCC3      4.0    40                    3                       3           6"""
 
     magic_formula = magicformulabr.MagicFormula(magic_method="2")
     with patch.object(magic_formula, "pd_df", pd_df):
         magic_formula.calc_rank()
         assert magic_formula.pd_df.to_string() == expected_result
+
+
+def test_calc_rank_metod_2_without_detail(pd_df):
+    expected_result = """\
+       EV/EBIT  ROIC  Rank_Final
+DDDD4      2.0    90           3
+AAAA3      0.2    10           5
+BBBB3      8.0    60           6
+CCCC3      4.0    40           6"""
+
+    magic_formula = magicformulabr.MagicFormula(magic_method="2")
+    with patch.object(magic_formula, "pd_df", pd_df):
+        magic_formula.calc_rank(detail=False)
+        assert magic_formula.pd_df.to_string() == expected_result
+
+
+def test_calc_rank_metod_2_top(pd_df):
+    expected_result = """\
+       EV/EBIT  ROIC  Rank_earnings_yield  Rank_return_on_capital  Rank_Final
+DDDD4      2.0    90                    2                       1           3
+AAAA3      0.2    10                    1                       4           5
+BBBB3      8.0    60                    4                       2           6"""
+
+    magic_formula = magicformulabr.MagicFormula(magic_method="2")
+    with patch.object(magic_formula, "pd_df", pd_df):
+        magic_formula.calc_rank(top=3)
+        assert magic_formula.pd_df.to_string() == expected_result
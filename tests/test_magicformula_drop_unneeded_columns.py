@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Test drop_unneeded_columns method."""
+
+import pytest
+from unittest.mock import patch
+import pandas as pd
+from src import magicformulabr
+
+
+@pytest.fixture
+def pd_df():
+    columns = ["Cotação", "P/L", "Div.Yield", "EV/EBIT", "ROIC", "ROE", "Liq.2meses"]
+    df = pd.DataFrame([range(len(columns))], columns=columns, index=["AAAA3"])
+    return df
+
+
+@pytest.mark.parametrize(
+    "level, expected_columns",
+    [
+        (0, ["EV/EBIT", "ROIC"]),
+        (1, ["Cotação", "P/L", "Div.Yield", "EV/EBIT", "ROIC", "ROE"]),
+        (2, ["Cotação", "P/L", "Div.Yield", "EV/EBIT", "ROIC", "ROE", "Liq.2meses"]),
+    ],
+)
+def test_drop_unneeded_columns_metod_2(pd_df, level, expected_columns):
+    magic_formula = magicformulabr.MagicFormula(magic_method="2")
+    with patch.object(magic_formula, "pd_df", pd_df):
+        magic_formula.drop_unneeded_columns(level)
+        assert magic_formula.pd_df.columns.tolist() == expected_columns
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""Test filter_data method."""
+
+import pytest
+from unittest.mock import patch
+import pandas as pd
+from src import magicformulabr
+
+
+@pytest.fixture
+def pd_df():
+    d = {
+        "EV/EBIT": [0.2, -8, 4, 2, 3],
+        "ROIC": [10, 60, 0, 90, 20],
+        "Liq.2meses": [1000.0, 500.0, 300.0, 0.0, 100.0],
+    }
+    df = pd.DataFrame(data=d, index=["AAAA3", "BBBB3", "CCCC3", "DDDD4", "EEEE3"])
+    return df
+
+
+def test_filter_data_metod_2(pd_df, caplog):
+    magic_formula = magicformulabr.MagicFormula(magic_method="2")
+    with patch.object(magic_formula, "pd_df", pd_df):
+        with caplog.at_level("DEBUG", logger=magicformulabr.log.name):
+            magic_formula.filter_data()
+        assert magic_formula.pd_df.index.tolist() == ["AAAA3", "EEEE3"]
+        assert "DDDD4" in caplog.text
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Test get_data method."""
+
+import io
+import pytest
+from unittest.mock import MagicMock, patch
+from src import magicformulabr
+
+HTML = """\
+<html><body>
+<table><tr><td>menu</td></tr></table>
+<table id="resultado">
+<thead><tr>
+<th>Papel</th><th>Cotação</th><th>EV/EBIT</th><th>ROIC</th><th>Div.Yield</th>
+<th>Liq.2meses</th>
+</tr></thead>
+<tbody>
+<tr><td>AAAA3</td><td>47,71</td><td>0,33</td><td>56,48%</td><td>4,49%</td>
+<td>1.230.000,00</td></tr>
+<tr><td>BBBB3</td><td>6,61</td><td>-1,92</td><td>-8,10%</td><td>10,12%</td>
+<td>0,00</td></tr>
+</tbody>
+</table>
+</body></html>
+"""
+
+
+@pytest.fixture
+def response():
+    response = MagicMock()
+    response.raw = io.BytesIO(HTML.encode("iso-8859-1"))
+    response.encoding = "ISO-8859-1"
+    return response
+
+
+def test_get_data(response):
+    expected_result = """\
+       Cotação  EV/EBIT   ROIC Div.Yield  Liq.2meses
+AAAA3    47.71     0.33  56.48     4,49%   1230000.0
+BBBB3     6.61    -1.92  -8.10    10,12%         0.0"""
+
+    magic_formula = magicformulabr.MagicFormula(magic_method="2")
+    with patch.object(magic_formula, "session") as session:
+        session.get.return_value.__enter__.return_value = response
+        magic_formula.get_data()
+        assert magic_formula.pd_df.index.name == "Papel"
+        assert magic_formula.pd_df.to_string(index_names=False) == expected_result
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Test MagicFormula initialization."""
+
+import pytest
+from src import magicformulabr
+
+
+@pytest.mark.parametrize(
+    "magic_method, earnings_yield, ret_on_capital",
+    [
+        (1, "P/L", "ROE"),
+        (2, "EV/EBIT", "ROIC"),
+        ("2", "EV/EBIT", "ROIC"),
+        (3, "EV/EBITDA", "ROIC"),
+    ],
+)
+def test_init_magic_method(magic_method, earnings_yield, ret_on_capital):
+    magic_formula = magicformulabr.MagicFormula(magic_method=magic_method)
+    assert magic_formula.earnings_yield == earnings_yield
+    assert magic_formula.ret_on_capital == ret_on_capital
+
+
+@pytest.mark.parametrize("magic_method", [0, 4, -1, "9"])
+def test_init_invalid_magic_method(magic_method):
+    with pytest.raises(ValueError):
+        magicformulabr.MagicFormula(magic_method=magic_method)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""Test pct_column_to_float method."""
+
+import pandas as pd
+from src import magicformulabr
+
+
+def test_pct_column_to_float():
+    column = pd.Series(["18,83%", "-15,94%", "1.223,61%", "0,00%"])
+
+    result = magicformulabr.MagicFormula.pct_column_to_float(column)
+
+    assert result.tolist() == [18.83, -15.94, 1223.61, 0.0]
+
+
+def test_pct_column_to_float_numeric_column():
+    column = pd.Series([18.83, -15.94])
+
+    assert magicformulabr.MagicFormula.pct_column_to_float(column) is column
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Test rank_min function."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src import magicformulabr
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [0.2, 8, 4, 2],
+        [3, 1, 3, 2, 1, 3],
+        [5.5, 5.5, 5.5],
+        [7],
+        [],
+    ],
+)
+@pytest.mark.parametrize("ascending", [True, False])
+def test_rank_min_matches_pandas(values, ascending):
+    values = np.array(values, dtype=float)
+    expected = pd.Series(values, dtype=float).rank(method="min", ascending=ascending)
+
+    result = magicformulabr.rank_min(values, ascending=ascending)
+    assert result.tolist() == expected.tolist()
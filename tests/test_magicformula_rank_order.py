@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Test rank_order function."""
+
+import numpy as np
+import pytest
+from src import magicformulabr
+
+
+@pytest.fixture
+def rank():
+    return np.array([6.0, 3.0, 5.0, 3.0, 9.0, 5.0, 3.0, 8.0])
+
+
+def test_rank_order_full(rank):
+    assert magicformulabr.rank_order(rank).tolist() == [1, 3, 6, 2, 5, 0, 7, 4]
+
+
+@pytest.mark.parametrize("top", [1, 2, 3, 4, 5, 7])
+def test_rank_order_top_matches_stable_sort(rank, top):
+    expected = np.argsort(rank, kind="mergesort")[:top]
+
+    assert magicformulabr.rank_order(rank, top).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("top", [0, -2, 8, 20])
+def test_rank_order_top_out_of_range(rank, top):
+    expected = np.argsort(rank, kind="mergesort")
+
+    assert magicformulabr.rank_order(rank, top).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("top", [1, 20, 124])
+def test_rank_order_top_many_ties(top):
+    rank = np.random.default_rng(0).integers(2, 100, size=500)
+    expected = np.argsort(rank, kind="mergesort")[:top]
+
+    assert magicformulabr.rank_order(rank, top).tolist() == expected.tolist()
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Test show_rank method."""
+
+import pytest
+from unittest.mock import patch
+import pandas as pd
+from src import magicformulabr
+
+
+@pytest.fixture
+def pd_df():
+    d = {"EV/EBIT": [2.0, 0.2, 8.0], "ROIC": [90, 10, 60], "Rank_Final": [3, 5, 6]}
+    df = pd.DataFrame(data=d, index=["DDDD4", "AAAA3", "BBBB3"])
+    df.index.name = "Papel"
+    return df
+
+
+def test_show_rank_top(pd_df, capsys):
+    expected_result = """\
+   Papel  EV/EBIT  ROIC  Rank_Final
+1  DDDD4      2.0    90           3
+2  AAAA3      0.2    10           5
+"""
+
+    magic_formula = magicformulabr.MagicFormula(magic_method="2")
+    with patch.object(magic_formula, "pd_df", pd_df):
+        magic_formula.show_rank(2)
+        assert capsys.readouterr().out == expected_result
+        assert magic_formula.pd_df.index.tolist() == ["DDDD4", "AAAA3", "BBBB3"]